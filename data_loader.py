@@ -1,11 +1,41 @@
+import os
 import pandas as pd
+import streamlit as st
 
+DATASET_FILES = [
+    "daily_requests_2015Q1.csv",
+    "daily_requests_2015Q2.csv",
+    "daily_requests_2015Q3.csv",
+]
+
+def read_dataset_csv(file):
+    return pd.read_csv(
+        file,
+        delimiter=",",
+        encoding="utf-8",
+        engine="c",
+        dtype={"num_users": "int32", "num_requests": "int32", "avg_requests_per_user": "float32"},
+    )
+
+def feather_path(file):
+    return os.path.splitext(file)[0] + ".feather"
+
+def convert_datasets_to_feather():
+    # One-shot preprocessing step; the typed binary copies skip CSV parsing on load
+    for file in DATASET_FILES:
+        read_dataset_csv(file).to_feather(feather_path(file))
+
+@st.cache_data
 def load_and_prepare_datasets():
-    dataset_files = [
-        "daily_requests_2015Q1.csv",
-        "daily_requests_2015Q2.csv",
-        "daily_requests_2015Q3.csv",
-    ]
-    datasets = [pd.read_csv(file, delimiter=",", encoding="utf-8") for file in dataset_files]
+    datasets = []
+    for file in DATASET_FILES:
+        feather_file = feather_path(file)
+        # Fall back to the CSV when the Feather copy is missing or older than the source
+        if os.path.exists(feather_file) and os.path.getmtime(feather_file) >= os.path.getmtime(file):
+            datasets.append(pd.read_feather(feather_file))
+        else:
+            datasets.append(read_dataset_csv(file))
     return datasets
 
+if __name__ == "__main__":
+    convert_datasets_to_feather()
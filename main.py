@@ -4,6 +4,12 @@ from models import SimulationParameters
 from simulation import OffNetSimulator
 import visualization
 
+@st.cache_resource(max_entries=32)
+def get_simulator(dataset_name, avg_num_users, _params, _dataset) -> OffNetSimulator:
+    # Keyed on the dataset and the average number of users only: those are the
+    # sole inputs to the dataset scaling, the other parameters are applied per run
+    return OffNetSimulator(_params, _dataset)
+
 def main():
     st.title("Off-Net Feasibility Calculator")
 
@@ -51,7 +57,7 @@ def main():
             sla_percentage=sla_percentage if compute_mode == "AWS" else 0.0,
         )
 
-        simulator = OffNetSimulator(params, selected_dataset)
+        simulator = get_simulator(dataset_choice, avg_num_users, params, selected_dataset).with_params(params)
         results = simulator.run_simulation(compute_aws=(compute_mode == "AWS"))
 
         visualization.display_results(results, compute_mode)
@@ -22,3 +22,5 @@ class SimulationResults:
     final_recommendation: str = ""
     aws_transfer_link_cost: float = 0.0
     required_bandwidth_gbps: float = 0.0
+    total_on_net_cost: float = 0.0   # Full precision, as used for the recommendation
+    total_off_net_cost: float = 0.0
@@ -1,21 +1,115 @@
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import pandas as pd
 import numpy as np
 from models import SimulationResults
 
+try:
+    from numba import njit, prange
+except ImportError:
+    # Without Numba the kernels below run as plain Python loops
+    njit = None
+    prange = range
+
+def _jit(*args, **options):
+    # Compile with Numba when it is installed, otherwise keep the Python function
+    def decorate(func):
+        return func if njit is None else njit(*args, **options)(func)
+    return decorate
+
+# Explicit signatures compile eagerly at import (or load from the on-disk cache),
+# so the first "Run Simulation" does not pay for JIT compilation.
+# Every array is a contiguous column (struct of arrays), so the kernel skips stride handling;
+# the running totals make the loop itself a serial scalar chain.
+_SIMULATE_SIGNATURE = "void(f4[::1], f8, f8, f8, f8, f8, f8, f8, i8, b1, f8, f4[::1], f8[::1], f8[::1])"
+
+@_jit(_SIMULATE_SIGNATURE, cache=True)
+def _simulate(daily_requests, avg_request_size_gb, off_rate, on_rate, hw_off_daily, hw_on_daily,
+              upfront_off, upfront_on, lifecycle_days, compute_aws, daily_link_cost,
+              daily_data_volume, on_net_cum, off_net_cum):
+    # Day 1 carries the upfront hardware cost, each later day the cost of the day before.
+    # The data volume is computed once per day and shared by both cost arms; it is
+    # only stored when an output array of the full length is passed.
+    store_volume = daily_data_volume.shape[0] > 0
+    on_net_total = upfront_on
+    off_net_total = upfront_off
+    previous_volume = 0.0
+    for day in range(daily_requests.shape[0]):
+        if day > 0:
+            off_net_total += previous_volume * off_rate + hw_off_daily
+            if compute_aws:
+                on_net_total += hw_on_daily + daily_link_cost
+            else:
+                on_net_total += previous_volume * on_rate + hw_on_daily
+
+        # Add lifecycle hardware costs
+        if (day + 1) % lifecycle_days == 0:
+            on_net_total += upfront_on
+            off_net_total += upfront_off
+
+        on_net_cum[day] = on_net_total
+        off_net_cum[day] = off_net_total
+
+        previous_volume = daily_requests[day] * avg_request_size_gb
+        if store_volume:
+            daily_data_volume[day] = previous_volume
+
+# Compiled lazily on the first sweep: the UI never runs it, and initializing the
+# parallel threading layer at import would slow down every cold start
+@_jit(parallel=True, cache=True)
+def _simulate_grid(scenarios, daily_requests, compute_aws, on_net_cum, off_net_cum):
+    # One row of `scenarios` per parameter set; every scenario writes only its own
+    # output row, so the scenarios run independently across threads.
+    # The user scaling is folded into the size per request, so no per-scenario
+    # copy of the requests is needed, and the daily volume is not kept.
+    no_volume = np.empty(0, dtype=np.float32)
+    for s in prange(scenarios.shape[0]):
+        _simulate(
+            daily_requests,
+            scenarios[s, 0] * scenarios[s, 1],
+            scenarios[s, 2],
+            scenarios[s, 3],
+            scenarios[s, 4],
+            scenarios[s, 5],
+            scenarios[s, 6],
+            scenarios[s, 7],
+            np.int64(scenarios[s, 8]),
+            compute_aws,
+            scenarios[s, 9],
+            no_volume,
+            on_net_cum[s],
+            off_net_cum[s],
+        )
+
+def _cycle_days(values, T_days):
+    # Repeat the dataset until it covers the time horizon
+    reps = (T_days + len(values) - 1) // len(values)
+    return np.tile(values, reps)[:T_days]
+
 class OffNetSimulator:
     def __init__(self, params, user_data):
         self.params = params
-        self.user_data = user_data
-        self.adjust_dataset()
-
-    def adjust_dataset(self):
-        current_avg_users = self.user_data["num_users"].mean()
-        adjustment_factor = self.params.avg_num_users / current_avg_users
-        self.user_data["num_users"] *= adjustment_factor
-        self.user_data["num_requests"] *= adjustment_factor
+        # Scale the dataset to the requested average number of users without
+        # touching the caller's (possibly cached) DataFrame
+        adjustment_factor = params.avg_num_users / user_data["num_users"].mean()
+        self.users = np.ascontiguousarray(user_data["num_users"].to_numpy(dtype=np.float64) * adjustment_factor, dtype=np.float32)
+        self.requests = np.ascontiguousarray(user_data["num_requests"].to_numpy(dtype=np.float64) * adjustment_factor, dtype=np.float32)
+
+    def with_params(self, params):
+        # The scaled arrays only depend on avg_num_users: they are shared when it is
+        # unchanged and rescaled for the copy otherwise
+        simulator = copy.copy(self)
+        simulator.params = params
+        if params.avg_num_users != self.params.avg_num_users:
+            scale = params.avg_num_users / self.params.avg_num_users
+            simulator.users = (self.users.astype(np.float64) * scale).astype(np.float32)
+            simulator.requests = (self.requests.astype(np.float64) * scale).astype(np.float32)
+        return simulator
 
     def compute_aws_bandwidth(self):
-        total_requests = self.user_data["num_requests"].sum()
+        total_requests = self.requests.sum(dtype=np.float64)
         requests_per_second = total_requests / (24 * 60 * 60)
         data_volume_per_second_gbps = requests_per_second * (self.params.avg_request_size_kb / 1_048_576 / 1024)
 
@@ -24,66 +118,65 @@ class OffNetSimulator:
         return required_bandwidth_gbps, transfer_link_cost_daily
 
     def run_simulation(self, compute_aws=False) -> SimulationResults:
-        T_days = self.params.time_horizon_days
-        avg_request_size_gb = self.params.avg_request_size_kb / 1_048_576  # Convert KB to GB
-        hardware_life_cycle_days = self.params.hardware_life_cycle_years * 365
-
-        # Initialize costs with upfront hardware costs
-        on_net_costs = [self.params.upfront_hardware_cost_on_net]
-        off_net_costs = [self.params.upfront_hardware_cost_off_net]
-        sent_requests = []
-        sent_data_gb = []
-        active_users = []
+        p = self.params
+        T_days = p.time_horizon_days
+        avg_request_size_gb = p.avg_request_size_kb / 1_048_576  # Convert KB to GB
+        hardware_life_cycle_days = p.hardware_life_cycle_years * 365
+        hw_on_daily = p.hardware_cost_on_net_per_month / 30.0
+        hw_off_daily = p.hardware_cost_off_net_per_month / 30.0
+        on_rate = p.on_net_bandwidth_cost_per_gb
+        off_rate = p.off_net_bandwidth_cost_per_gb
 
         # AWS-specific metrics
         required_bandwidth_gbps = 0.0
         transfer_link_cost = 0.0
+        daily_transfer_link_cost = 0.0
+        if compute_aws:
+            # Depends only on the full dataset and the parameters, so compute it once
+            required_bandwidth_gbps, daily_transfer_link_cost = self.compute_aws_bandwidth()
+
+        # Cycle through dataset
+        daily_requests = _cycle_days(self.requests, T_days)
+        daily_users = _cycle_days(self.users, T_days)
+
+        # The data volume is filled in by the kernel in the same pass as the costs
+        daily_data_volume = np.empty(T_days, dtype=daily_requests.dtype)
+        on_net_cum = np.empty(T_days, dtype=np.float64)
+        off_net_cum = np.empty(T_days, dtype=np.float64)
+        _simulate(
+            daily_requests,
+            avg_request_size_gb,
+            off_rate,
+            on_rate,
+            hw_off_daily,
+            hw_on_daily,
+            float(p.upfront_hardware_cost_off_net),
+            float(p.upfront_hardware_cost_on_net),
+            hardware_life_cycle_days,
+            compute_aws,
+            daily_transfer_link_cost,
+            daily_data_volume,
+            on_net_cum,
+            off_net_cum,
+        )
 
-        for day in range(T_days):
-            day_index = day % len(self.user_data)  # Cycle through dataset
-            daily_users = self.user_data.loc[day_index, "num_users"]
-            daily_requests = self.user_data.loc[day_index, "num_requests"]
-            daily_data_volume = daily_requests * avg_request_size_gb
-
-            if compute_aws:
-                required_bandwidth_gbps, daily_transfer_link_cost = self.compute_aws_bandwidth()
-                on_net_total_cost = self.params.hardware_cost_on_net_per_month / 30 + daily_transfer_link_cost
-                off_net_bandwidth_cost = daily_data_volume * self.params.off_net_bandwidth_cost_per_gb
-                off_net_total_cost = off_net_bandwidth_cost + (self.params.hardware_cost_off_net_per_month / 30)
-            else:
-                on_net_bandwidth_cost = daily_data_volume * self.params.on_net_bandwidth_cost_per_gb
-                on_net_total_cost = on_net_bandwidth_cost + (self.params.hardware_cost_on_net_per_month / 30)
-                off_net_bandwidth_cost = daily_data_volume * self.params.off_net_bandwidth_cost_per_gb
-                off_net_total_cost = off_net_bandwidth_cost + (self.params.hardware_cost_off_net_per_month / 30)
-
-            # Add lifecycle hardware costs
-            if (day + 1) % hardware_life_cycle_days == 0:
-                on_net_costs[-1] += self.params.upfront_hardware_cost_on_net
-                off_net_costs[-1] += self.params.upfront_hardware_cost_off_net
-
-            # Append daily metrics
-            on_net_costs.append(on_net_total_cost)
-            off_net_costs.append(off_net_total_cost)
-            sent_requests.append(daily_requests)
-            sent_data_gb.append(daily_data_volume)
-            active_users.append(daily_users)
-
-        # Create the timeline DataFrame
+        # Create the timeline DataFrame; float32 is plenty for display and halves
+        # the payload sent to the browser
         df = pd.DataFrame({
-            "Day": range(1, T_days + 1),
-            "On-Net Cost": np.cumsum(on_net_costs[:T_days]),
-            "Off-Net Cost": np.cumsum(off_net_costs[:T_days]),
-            "Sent Requests": sent_requests,
-            "Sent Data Volume (GB)": sent_data_gb,
-            "Active Users": active_users
-        })
-
-        # Final recommendation
-        total_on_net = df["On-Net Cost"].iloc[-1]
-        total_off_net = df["Off-Net Cost"].iloc[-1]
+            "Day": np.arange(1, T_days + 1, dtype=np.int32),
+            "On-Net Cost": on_net_cum.astype(np.float32, copy=False),
+            "Off-Net Cost": off_net_cum.astype(np.float32, copy=False),
+            "Sent Requests": daily_requests,
+            "Sent Data Volume (GB)": daily_data_volume,
+            "Active Users": daily_users
+        }, copy=False)
+
+        # Final recommendation, compared on the full-precision totals
+        total_on_net = float(on_net_cum[-1])
+        total_off_net = float(off_net_cum[-1])
 
         if compute_aws:
-            transfer_link_cost = required_bandwidth_gbps * self.params.transfer_link_cost_per_gbps
+            transfer_link_cost = required_bandwidth_gbps * p.transfer_link_cost_per_gbps
             recommendation = (
                 f"Required bandwidth: {required_bandwidth_gbps:.2f} Gbps. "
                 f"Transfer link cost: ${transfer_link_cost:.2f}/month."
@@ -99,6 +192,53 @@ class OffNetSimulator:
             timeline=df,
             final_recommendation=recommendation,
             aws_transfer_link_cost=transfer_link_cost,
-            required_bandwidth_gbps=required_bandwidth_gbps
+            required_bandwidth_gbps=required_bandwidth_gbps,
+            total_on_net_cost=total_on_net,
+            total_off_net_cost=total_off_net
         )
 
+    def run_scenarios(self, params_list, compute_aws=False):
+        # Cumulative on-net/off-net costs for a sweep of parameter sets, one row per
+        # scenario. The dataset stays scaled for self.params; each scenario rescales
+        # it for its own avg_num_users. The horizon comes from the scenarios.
+        if not params_list:
+            raise ValueError("At least one scenario is required.")
+        T_days = params_list[0].time_horizon_days
+        if any(params.time_horizon_days != T_days for params in params_list):
+            raise ValueError("All scenarios must share the same time horizon.")
+
+        scenarios = np.empty((len(params_list), 10), dtype=np.float64)
+        for s, params in enumerate(params_list):
+            scale = params.avg_num_users / self.params.avg_num_users
+            daily_transfer_link_cost = 0.0
+            if compute_aws:
+                # with_params rescales the requests for the scenario's avg_num_users
+                _, daily_transfer_link_cost = self.with_params(params).compute_aws_bandwidth()
+            scenarios[s] = (
+                scale,
+                params.avg_request_size_kb / 1_048_576,  # Convert KB to GB
+                params.off_net_bandwidth_cost_per_gb,
+                params.on_net_bandwidth_cost_per_gb,
+                params.hardware_cost_off_net_per_month / 30,
+                params.hardware_cost_on_net_per_month / 30,
+                params.upfront_hardware_cost_off_net,
+                params.upfront_hardware_cost_on_net,
+                params.hardware_life_cycle_years * 365,
+                daily_transfer_link_cost,
+            )
+
+        on_net_cum = np.empty((len(params_list), T_days), dtype=np.float64)
+        off_net_cum = np.empty((len(params_list), T_days), dtype=np.float64)
+        _simulate_grid(scenarios, _cycle_days(self.requests, T_days), compute_aws, on_net_cum, off_net_cum)
+        return on_net_cum, off_net_cum
+
+def _run_one(params, user_data, compute_aws):
+    # Module-level so it can be pickled into the worker processes
+    return OffNetSimulator(params, user_data).run_simulation(compute_aws=compute_aws)
+
+def simulate_many(param_list, user_data, compute_aws=False) -> list[SimulationResults]:
+    # Full simulation results for independent parameter sets, spread over CPU cores.
+    # Works with or without Numba; workers are spawned rather than forked, since a
+    # forked child of a process that started Numba's threading layer can hang.
+    with ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(_run_one, param_list, repeat(user_data), repeat(compute_aws)))
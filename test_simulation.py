@@ -0,0 +1,142 @@
+import dataclasses
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models import SimulationParameters
+from simulation import OffNetSimulator
+
+REPO_DIR = Path(__file__).parent
+DATASET = REPO_DIR / "daily_requests_2015Q2.csv"
+
+def make_params(compute_aws, **overrides):
+    params = SimulationParameters(
+        time_horizon_days=400,
+        avg_request_size_kb=500.0,
+        avg_num_users=1200,
+        off_net_bandwidth_cost_per_gb=0.05,
+        on_net_bandwidth_cost_per_gb=0.0 if compute_aws else 0.10,
+        hardware_cost_off_net_per_month=5000.0,
+        hardware_cost_on_net_per_month=2000.0,
+        upfront_hardware_cost_off_net=20000.0,
+        upfront_hardware_cost_on_net=10000.0,
+        hardware_life_cycle_years=1,
+        transfer_link_cost_per_gbps=1000.0 if compute_aws else 0.0,
+        sla_percentage=95.0 if compute_aws else 0.0,
+    )
+    return dataclasses.replace(params, **overrides)
+
+def test_simulator_does_not_mutate_input_dataframe():
+    user_data = pd.read_csv(DATASET)
+    original = user_data.copy()
+    params = make_params(False, avg_num_users=3000)
+
+    first = OffNetSimulator(params, user_data).run_simulation()
+    second = OffNetSimulator(params, user_data).run_simulation()
+
+    pd.testing.assert_frame_equal(user_data, original)
+    pd.testing.assert_frame_equal(second.timeline, first.timeline)
+
+def test_results_expose_the_totals_behind_the_recommendation():
+    results = OffNetSimulator(make_params(False), pd.read_csv(DATASET)).run_simulation()
+
+    assert results.total_on_net_cost == pytest.approx(results.timeline["On-Net Cost"].iloc[-1], rel=1e-6)
+    assert results.total_off_net_cost == pytest.approx(results.timeline["Off-Net Cost"].iloc[-1], rel=1e-6)
+    off_net_wins = results.total_off_net_cost < results.total_on_net_cost
+    assert results.final_recommendation.startswith("Off-net" if off_net_wins else "On-net")
+
+@pytest.mark.parametrize("compute_aws", [False, True])
+def test_with_params_rescales_for_new_user_count(compute_aws):
+    user_data = pd.read_csv(DATASET)
+    params = make_params(compute_aws, avg_num_users=4000)
+    reused = OffNetSimulator(make_params(compute_aws, avg_num_users=1000), user_data).with_params(params)
+    fresh = OffNetSimulator(params, user_data)
+
+    reused_results = reused.run_simulation(compute_aws=compute_aws)
+    fresh_results = fresh.run_simulation(compute_aws=compute_aws)
+    assert reused_results.timeline["Active Users"].mean() == pytest.approx(4000, rel=1e-3)
+    pd.testing.assert_frame_equal(reused_results.timeline, fresh_results.timeline, rtol=1e-6)
+    assert reused_results.aws_transfer_link_cost == pytest.approx(fresh_results.aws_transfer_link_cost)
+
+    params_list = [make_params(compute_aws, avg_num_users=users) for users in (500, 2000)]
+    reused_costs = reused.run_scenarios(params_list, compute_aws)
+    fresh_costs = fresh.run_scenarios(params_list, compute_aws)
+    for reused_cum, fresh_cum in zip(reused_costs, fresh_costs):
+        np.testing.assert_allclose(reused_cum, fresh_cum, rtol=1e-6)
+
+@pytest.mark.parametrize("compute_aws", [False, True])
+def test_run_scenarios_matches_run_simulation(compute_aws):
+    user_data = pd.read_csv(DATASET)
+    params_list = [
+        make_params(compute_aws, avg_num_users=users, off_net_bandwidth_cost_per_gb=cost)
+        for users in (500, 1200, 3000)
+        for cost in (0.01, 0.05)
+    ]
+    simulator = OffNetSimulator(make_params(compute_aws), user_data)
+    on_net_cum, off_net_cum = simulator.run_scenarios(params_list, compute_aws=compute_aws)
+
+    assert on_net_cum.shape == off_net_cum.shape == (len(params_list), 400)
+    for row, params in enumerate(params_list):
+        timeline = OffNetSimulator(params, user_data).run_simulation(compute_aws=compute_aws).timeline
+        np.testing.assert_allclose(on_net_cum[row], timeline["On-Net Cost"], rtol=1e-6)
+        np.testing.assert_allclose(off_net_cum[row], timeline["Off-Net Cost"], rtol=1e-6)
+
+def test_run_scenarios_rejects_mixed_time_horizons():
+    simulator = OffNetSimulator(make_params(False), pd.read_csv(DATASET))
+    params_list = [make_params(False), make_params(False, time_horizon_days=30)]
+    with pytest.raises(ValueError, match="same time horizon"):
+        simulator.run_scenarios(params_list)
+    with pytest.raises(ValueError, match="At least one scenario"):
+        simulator.run_scenarios([])
+
+def test_run_scenarios_uses_the_scenario_time_horizon():
+    user_data = pd.read_csv(DATASET)
+    simulator = OffNetSimulator(make_params(False, time_horizon_days=90), user_data)
+    params = make_params(False, time_horizon_days=30)
+    on_net_cum, off_net_cum = simulator.run_scenarios([params, params])
+
+    assert on_net_cum.shape == off_net_cum.shape == (2, 30)
+    timeline = OffNetSimulator(params, user_data).run_simulation().timeline
+    np.testing.assert_allclose(on_net_cum[1], timeline["On-Net Cost"], rtol=1e-6)
+    np.testing.assert_allclose(off_net_cum[1], timeline["Off-Net Cost"], rtol=1e-6)
+
+SIMULATE_MANY_SCRIPT = textwrap.dedent("""
+    import pandas as pd
+    import simulation
+    from test_simulation import DATASET, make_params
+
+    user_data = pd.read_csv(DATASET)
+    params_list = [make_params(True, avg_num_users=users) for users in (500, 1200)]
+    results = simulation.simulate_many(params_list, user_data, compute_aws=True)
+    for params, result in zip(params_list, results):
+        expected = simulation.OffNetSimulator(params, user_data).run_simulation(compute_aws=True)
+        assert result.timeline.equals(expected.timeline)
+        assert result.final_recommendation == expected.final_recommendation
+    print("numba" if simulation.njit is not None else "python")
+""")
+
+@pytest.mark.parametrize("with_numba", [True, False])
+def test_simulate_many_runs_and_exits(tmp_path, with_numba):
+    env = dict(os.environ)
+    python_path = [str(REPO_DIR)]
+    if with_numba:
+        pytest.importorskip("numba")
+    else:
+        # Shadow numba in this process and in the spawned workers
+        (tmp_path / "numba").mkdir()
+        (tmp_path / "numba" / "__init__.py").write_text("raise ImportError('numba disabled')\n")
+        python_path.insert(0, str(tmp_path))
+    env["PYTHONPATH"] = os.pathsep.join(python_path + [env.get("PYTHONPATH", "")])
+
+    completed = subprocess.run(
+        [sys.executable, "-c", SIMULATE_MANY_SCRIPT],
+        cwd=REPO_DIR, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == ("numba" if with_numba else "python")
@@ -2,12 +2,15 @@ import streamlit as st
 import pandas as pd
 
 def display_results(results, compute_mode):
+    # Index the timeline by day once and slice it for every chart
+    chart_data = results.timeline.set_index("Day")
+
     st.subheader("Results Overview")
     st.write(results.final_recommendation)
 
     # Plot cumulative costs (On-Net vs Off-Net)
     st.subheader("Cost Comparison")
-    st.line_chart(results.timeline.set_index("Day")[["On-Net Cost", "Off-Net Cost"]], 
+    st.line_chart(chart_data[["On-Net Cost", "Off-Net Cost"]], 
                   use_container_width=True)
 
     # Specific Metrics for AWS Mode
@@ -27,17 +30,17 @@ def display_results(results, compute_mode):
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        st.line_chart(results.timeline.set_index("Day")["Active Users"], 
+        st.line_chart(chart_data["Active Users"], 
                       use_container_width=True)
         st.caption("Active Users Per Day")
 
     with col2:
-        st.line_chart(results.timeline.set_index("Day")["Sent Requests"], 
+        st.line_chart(chart_data["Sent Requests"], 
                       use_container_width=True)
         st.caption("Number of Requests Sent Per Day")
 
     with col3:
-        st.line_chart(results.timeline.set_index("Day")["Sent Data Volume (GB)"], 
+        st.line_chart(chart_data["Sent Data Volume (GB)"], 
                       use_container_width=True)
         st.caption("Data Volume Sent Per Day (GB)")
 
@@ -47,5 +50,5 @@ def display_results(results, compute_mode):
 
     # Highlight recommendations and summary metrics
     st.subheader("Key Metrics Summary")
-    st.write(f"Total On-Net Cost: ${results.timeline['On-Net Cost'].iloc[-1]:,}")
-    st.write(f"Total Off-Net Cost: ${results.timeline['Off-Net Cost'].iloc[-1]:,}")
+    st.write(f"Total On-Net Cost: ${results.total_on_net_cost:,.2f}")
+    st.write(f"Total Off-Net Cost: ${results.total_off_net_cost:,.2f}")